@@ -30,10 +30,23 @@
 # Device: 7265DSP
 
 import time
+from functools import cached_property
 import numpy as np
-from collections import OrderedDict
 from EmptyDeviceClass import EmptyDevice
 
+# replacements to convert unit and prefix to number
+_UNIT_CHARS = (
+    ("V", ""),
+    ("s", ""),
+    (" ", ""),
+    ("n", "e-9"),
+    ("µ", "e-6"),
+    ("m", "e-3"),
+    ("k", "e3"),
+    ("M", "e6"),
+    ("G", "e9"),
+)
+
 
 class Device(EmptyDevice):
 
@@ -47,6 +60,194 @@ class Device(EmptyDevice):
     </ul>
     """
 
+    # I started to define dictionaries to translate GUI-commands into remote commands
+    # Attention: No Gui-selection should occur twice
+    commands = {
+        # "Frequency [Hz]": "FREQ",
+        # "Internal": "",
+        "Float": "FLOAT 1",
+        "Ground": "FLOAT 0",
+    }
+
+    source_commands = {
+        "Internal": "IE 0",
+        "External TTL Rear": "IE 1",
+        "External Analog Front": "IE 2",
+    }
+
+    input_commands = {
+        "Current B High bandwidth, Front": "IMODE1; REF FRONT",
+        "Current B Low noise, Front": "IMODE2; REF FRONT",
+        "Voltage A, Front": "IMODE0; VMODE 1; REF FRONT",
+        "Voltage -B, Front": "IMODE0; VMODE 2; REF FRONT",
+        "Voltage A-B, Front": "IMODE0; VMODE 3; REF FRONT",
+        "Current B High bandwidth, Rear": "IMODE1; REF REAR",
+        "Current B Low noise, Rear": "IMODE2; REF REAR",
+        "Voltage A, Rear": "IMODE0; VMODE 1; REF REAR",
+        "Voltage -B, Rear": "IMODE0; VMODE 2; REF REAR",
+        "Voltage A-B, Rear": "IMODE0; VMODE 3; REF REAR",
+    }
+
+    gains = {
+        "Auto gain": "AUTOMATIC 1",
+        "0 dB": "AUTOMATIC 0; ACGAIN 0",
+        "10 dB": "AUTOMATIC 0; ACGAIN 1",
+        "20 dB": "AUTOMATIC 0; ACGAIN 2",
+        "30 dB": "AUTOMATIC 0; ACGAIN 3",
+        "40 dB": "AUTOMATIC 0; ACGAIN 4",
+        "50 dB": "AUTOMATIC 0; ACGAIN 5",
+        "60 dB": "AUTOMATIC 0; ACGAIN 6",
+        "70 dB": "AUTOMATIC 0; ACGAIN 7",
+        "80 dB": "AUTOMATIC 0; ACGAIN 8",
+        "90 dB": "AUTOMATIC 0; ACGAIN 9",
+    }
+
+    inv_gains = {int(v[20:]): int(k[:-3]) for k, v in gains.items() if v.startswith("AUTOMATIC 0; ACGAIN")}
+
+    timeconstants = {
+        "10µ": "TC 0",
+        "20µ": "TC 1",
+        "40µ": "TC 2",
+        "80µ": "TC 3",
+        "160µ": "TC 4",
+        "320µ": "TC 5",
+        "640µ": "TC 6",
+        "5m": "TC 7",
+        "10m": "TC 8",
+        "20m": "TC 9",
+        "50m": "TC 10",
+        "100m": "TC 11",
+        "200m": "TC 12",
+        "500m": "TC 13",
+        "1": "TC 14",
+        "2": "TC 15",
+        "5": "TC 16",
+        "10": "TC 17",
+        "20": "TC 18",
+        "50": "TC 19",
+        "100": "TC 20",
+        "200": "TC 21",
+        "500": "TC 22",
+        "1k": "TC 23",
+        "2k": "TC 24",
+        "5k": "TC 25",
+        "10k": "TC 26",
+        "20k": "TC 27",
+        "50k": "TC 28",
+        "100k": "TC 29",
+    }
+
+    sensitivities_voltages = {
+        "2 nV": "SEN 1",
+        "5 nV": "SEN 2",
+        "10 nV": "SEN 3",
+        "20 nV": "SEN 4",
+        "50 nV": "SEN 5",
+        "100 nV": "SEN 6",
+        "200 nV": "SEN 7",
+        "500 nV": "SEN 8",
+        "1 µV": "SEN 9",
+        "2 µV": "SEN 10",
+        "5 µV": "SEN 11",
+        "10 µV": "SEN 12",
+        "20 µV": "SEN 13",
+        "50 µV": "SEN 14",
+        "100 µV": "SEN 15",
+        "200 µV": "SEN 16",
+        "500 µV": "SEN 17",
+        "1 mV": "SEN 18",
+        "2 mV": "SEN 19",
+        "5 mV": "SEN 20",
+        "10 mV": "SEN 21",
+        "20 mV": "SEN 22",
+        "50 mV": "SEN 23",
+        "100 mV": "SEN 24",
+        "200 mV": "SEN 25",
+        "500 mV": "SEN 26",
+        "1 V": "SEN 27",
+    }
+
+    sensitivities_currents_high_bandwidth = {
+        "2 fA": "SEN 1",
+        "5 fA": "SEN 2",
+        "10 fA": "SEN 3",
+        "20 fA": "SEN 4",
+        "50 fA": "SEN 5",
+        "100 fA": "SEN 6",
+        "200 fA": "SEN 7",
+        "500 fA": "SEN 8",
+        "1 pA": "SEN 9",
+        "2 pA": "SEN 10",
+        "5 pA": "SEN 11",
+        "10 pA": "SEN 12",
+        "20 pA": "SEN 13",
+        "50 pA": "SEN 14",
+        "100 pA": "SEN 15",
+        "200 pA": "SEN 16",
+        "500 pA": "SEN 17",
+        "1 nA": "SEN 18",
+        "2 nA": "SEN 19",
+        "5 nA": "SEN 20",
+        "10 nA": "SEN 21",
+        "20 nA": "SEN 22",
+        "50 nA": "SEN 23",
+        "100 nA": "SEN 24",
+        "200 nA": "SEN 25",
+        "500 nA": "SEN 26",
+        "1 µA": "SEN 27",
+    }
+
+    sensitivities_currents_low_noise = {
+        "2 fA": "SEN 7",
+        "5 fA": "SEN 8",
+        "10 fA": "SEN 9",
+        "20 fA": "SEN 10",
+        "50 fA": "SEN 11",
+        "100 fA": "SEN 12",
+        "200 fA": "SEN 13",
+        "500 fA": "SEN 14",
+        "1 pA": "SEN 15",
+        "2 pA": "SEN 16",
+        "5 pA": "SEN 17",
+        "10 pA": "SEN 18",
+        "20 pA": "SEN 19",
+        "50 pA": "SEN 20",
+        "100 pA": "SEN 21",
+        "200 pA": "SEN 22",
+        "500 pA": "SEN 23",
+        "1 nA": "SEN 24",
+        "2 nA": "SEN 25",
+        "5 nA": "SEN 26",
+        "10 nA": "SEN 27",
+    }
+
+    slopes = {
+        "6 dB/octave": "SLOPE 0",
+        "12 dB/octave": "SLOPE 1",
+        "18 dB/octave": "SLOPE 2",
+        "24 dB/octave": "SLOPE 3",
+    }
+
+    filter1_commands = {
+        "Off": "LF 0 0",
+        "50 Hz notch filter": "LF 1 1",
+        "60 Hz notch filter": "LF 1 0",
+        "100 Hz notch filter": "LF 2 1",
+        "120 Hz notch filter": "LF 2 0",
+        "50 Hz and 100 Hz notch filter": "LF 3 1",
+        "60 Hz and 120 Hz notch filter": "LF 3 0",
+    }
+
+    filter2_commands = {
+        "Sync filter off": "SYNC 0",
+        "Sync filter on": "SYNC 1",
+    }
+
+    coupling_commands = {
+        "Fast": "CP 0",
+        "Slow": "CP 1",
+    }
+
     def __init__(self):
         EmptyDevice.__init__(self)
         
@@ -66,198 +267,6 @@ class Device(EmptyDevice):
                                  "baudrate": 9600,
                             }
 
-        # I started to define dictionaries to translate GUI-commands into remote commands
-        # Attention: No Gui-selection should occur twice
-        self.commands = OrderedDict([ 
-                               # ("Frequency [Hz]", "FREQ"),
-                               # ("Internal", ""),
-                               ("Float", "FLOAT 1"),
-                               ("Ground", "FLOAT 0"),
-                            ])
-
-        self.source_commands = OrderedDict([
-                                            ("Internal", "IE 0"),
-                                            ("External TTL Rear", "IE 1"),
-                                            ("External Analog Front", "IE 2"),
-                                            ])
-                            
-        self.input_commands = OrderedDict([
-                                           ("Current B High bandwidth, Front", "IMODE1; REF FRONT"),
-                                           ("Current B Low noise, Front", "IMODE2; REF FRONT"),
-                                           ("Voltage A, Front", "IMODE0; VMODE 1; REF FRONT"),
-                                           ("Voltage -B, Front", "IMODE0; VMODE 2; REF FRONT"),
-                                           ("Voltage A-B, Front", "IMODE0; VMODE 3; REF FRONT"),
-                                           ("Current B High bandwidth, Rear", "IMODE1; REF REAR"),
-                                           ("Current B Low noise, Rear", "IMODE2; REF REAR"),
-                                           ("Voltage A, Rear", "IMODE0; VMODE 1; REF REAR"),
-                                           ("Voltage -B, Rear", "IMODE0; VMODE 2; REF REAR"),
-                                           ("Voltage A-B, Rear", "IMODE0; VMODE 3; REF REAR"),
-                                          ])
-                        
-        self.gains = OrderedDict([
-                               ("Auto gain", "AUTOMATIC 1"),
-                               ("0 dB", "AUTOMATIC 0; ACGAIN 0"),
-                               ("10 dB", "AUTOMATIC 0; ACGAIN 1"),
-                               ("20 dB", "AUTOMATIC 0; ACGAIN 2"),
-                               ("30 dB", "AUTOMATIC 0; ACGAIN 3"),
-                               ("40 dB", "AUTOMATIC 0; ACGAIN 4"),
-                               ("50 dB", "AUTOMATIC 0; ACGAIN 5"),
-                               ("60 dB", "AUTOMATIC 0; ACGAIN 6"),
-                               ("70 dB", "AUTOMATIC 0; ACGAIN 7"),
-                               ("80 dB", "AUTOMATIC 0; ACGAIN 8"),
-                               ("90 dB", "AUTOMATIC 0; ACGAIN 9"),
-                                ])
-                                
-        self.inv_gains = \
-            {int(v[20:]): int(k[:-3]) for k, v in self.gains.items() if v.startswith("AUTOMATIC 0; ACGAIN")}
-        # print(self.inv_gains)
-                               
-        self.timeconstants = OrderedDict([
-                                ("10µ", "TC 0"),
-                                ("20µ", "TC 1"),
-                                ("40µ", "TC 2"),
-                                ("80µ", "TC 3"),
-                                ("160µ", "TC 4"),
-                                ("320µ", "TC 5"),
-                                ("640µ", "TC 6"),
-                                ("5m", "TC 7"),
-                                ("10m", "TC 8"),
-                                ("20m", "TC 9"),
-                                ("50m", "TC 10"),
-                                ("100m", "TC 11"),
-                                ("200m", "TC 12"),
-                                ("500m", "TC 13"),
-                                ("1", "TC 14"),
-                                ("2", "TC 15"),
-                                ("5", "TC 16"),
-                                ("10", "TC 17"),
-                                ("20", "TC 18"),
-                                ("50", "TC 19"),
-                                ("100", "TC 20"),
-                                ("200", "TC 21"),
-                                ("500", "TC 22"),
-                                ("1k", "TC 23"),
-                                ("2k", "TC 24"),
-                                ("5k", "TC 25"),
-                                ("10k", "TC 26"),
-                                ("20k", "TC 27"),
-                                ("50k", "TC 28"),
-                                ("100k", "TC 29"),
-                            ])
-
-        self.timeconstants_numbers = [self.value_to_float(x) for x in self.timeconstants]
-
-        self.sensitivities_voltages = OrderedDict([
-            ("2 nV", "SEN 1"),
-            ("5 nV", "SEN 2"),
-            ("10 nV", "SEN 3"),
-            ("20 nV", "SEN 4"),
-            ("50 nV", "SEN 5"),
-            ("100 nV", "SEN 6"),
-            ("200 nV", "SEN 7"),
-            ("500 nV", "SEN 8"),
-            ("1 µV", "SEN 9"),
-            ("2 µV", "SEN 10"),
-            ("5 µV", "SEN 11"),
-            ("10 µV", "SEN 12"),
-            ("20 µV", "SEN 13"),
-            ("50 µV", "SEN 14"),
-            ("100 µV", "SEN 15"),
-            ("200 µV", "SEN 16"),
-            ("500 µV", "SEN 17"),
-            ("1 mV", "SEN 18"),
-            ("2 mV", "SEN 19"),
-            ("5 mV", "SEN 20"),
-            ("10 mV", "SEN 21"),
-            ("20 mV", "SEN 22"),
-            ("50 mV", "SEN 23"),
-            ("100 mV", "SEN 24"),
-            ("200 mV", "SEN 25"),
-            ("500 mV", "SEN 26"),
-            ("1 V", "SEN 27")
-        ])
-
-        self.sensitivities_currents_high_bandwidth = OrderedDict([
-            ("2 fA", "SEN 1"),
-            ("5 fA", "SEN 2"),
-            ("10 fA", "SEN 3"),
-            ("20 fA", "SEN 4"),
-            ("50 fA", "SEN 5"),
-            ("100 fA", "SEN 6"),
-            ("200 fA", "SEN 7"),
-            ("500 fA", "SEN 8"),
-            ("1 pA", "SEN 9"),
-            ("2 pA", "SEN 10"),
-            ("5 pA", "SEN 11"),
-            ("10 pA", "SEN 12"),
-            ("20 pA", "SEN 13"),
-            ("50 pA", "SEN 14"),
-            ("100 pA", "SEN 15"),
-            ("200 pA", "SEN 16"),
-            ("500 pA", "SEN 17"),
-            ("1 nA", "SEN 18"),
-            ("2 nA", "SEN 19"),
-            ("5 nA", "SEN 20"),
-            ("10 nA", "SEN 21"),
-            ("20 nA", "SEN 22"),
-            ("50 nA", "SEN 23"),
-            ("100 nA", "SEN 24"),
-            ("200 nA", "SEN 25"),
-            ("500 nA", "SEN 26"),
-            ("1 µA", "SEN 27")
-        ])
-
-        self.sensitivities_currents_low_noise = OrderedDict([
-            ("2 fA", "SEN 7"),
-            ("5 fA", "SEN 8"),
-            ("10 fA", "SEN 9"),
-            ("20 fA", "SEN 10"),
-            ("50 fA", "SEN 11"),
-            ("100 fA", "SEN 12"),
-            ("200 fA", "SEN 13"),
-            ("500 fA", "SEN 14"),
-            ("1 pA", "SEN 15"),
-            ("2 pA", "SEN 16"),
-            ("5 pA", "SEN 17"),
-            ("10 pA", "SEN 18"),
-            ("20 pA", "SEN 19"),
-            ("50 pA", "SEN 20"),
-            ("100 pA", "SEN 21"),
-            ("200 pA", "SEN 22"),
-            ("500 pA", "SEN 23"),
-            ("1 nA", "SEN 24"),
-            ("2 nA", "SEN 25"),
-            ("5 nA", "SEN 26"),
-            ("10 nA", "SEN 27"),
-        ])
-
-        self.slopes = OrderedDict([
-                        ("6 dB/octave",  "SLOPE 0"),
-                        ("12 dB/octave", "SLOPE 1"),
-                        ("18 dB/octave", "SLOPE 2"),
-                        ("24 dB/octave", "SLOPE 3"),
-                        ])
-                        
-        self.filter1_commands = OrderedDict([
-                        ("Off",  "LF 0 0"),
-                        ("50 Hz notch filter", "LF 1 1"),
-                        ("60 Hz notch filter", "LF 1 0"),
-                        ("100 Hz notch filter", "LF 2 1"),
-                        ("120 Hz notch filter", "LF 2 0"),
-                        ("50 Hz and 100 Hz notch filter", "LF 3 1"),
-                        ("60 Hz and 120 Hz notch filter", "LF 3 0"),
-                        ])
-
-        self.filter2_commands = OrderedDict([
-                               ("Sync filter off", "SYNC 0"),
-                               ("Sync filter on", "SYNC 1"),
-                            ])
-        
-        self.coupling_commands = OrderedDict([
-                                    ("Fast", "CP 0"),
-                                    ("Slow", "CP 1"),
-                                    ])
-
     def set_GUIparameter(self):
     
         gui_parameter = {
@@ -310,6 +319,14 @@ class Device(EmptyDevice):
         elif self.input.startswith("Current"):
             self.units = ["A", "deg", "Hz", "A", "A/sqrt(Hz)", "dB", "s"]
 
+        # the sensitivity commands depend on the input mode
+        if self.input.startswith("Voltage"):
+            self.sensitivities = self.sensitivities_voltages
+        elif "Current B Low noise" in self.input:
+            self.sensitivities = self.sensitivities_currents_low_noise
+        else:
+            self.sensitivities = self.sensitivities_currents_high_bandwidth
+
         self.plottype = [True, True, True, True, True, True, True]
         self.savetype = [True, True, True, True, True, True, True]
 
@@ -371,15 +388,7 @@ class Device(EmptyDevice):
 
         # Sensitivity adjustment
         if self.sensitivity != "Auto sensitivity":
-            if "Voltage" in self.input:
-                self.port.write(self.sensitivities_voltages[self.sensitivity])
-                # self.inv_sensitivities = {v: k for k, v in self.sensitivities_voltages.items()}
-            elif "Current B High bandwidth" in self.input:
-                self.port.write(self.sensitivities_currents_high_bandwidth[self.sensitivity])
-                # self.inv_sensitivities = {v: k for k, v in self.sensitivities_currents_high_bandwidth.items()}
-            elif "Current B Low noise" in self.input:
-                self.port.write(self.sensitivities_currents_low_noise[self.sensitivity])
-                # self.inv_sensitivities = {v: k for k, v in self.sensitivities_currents_low_noise.items()}
+            self.port.write(self.sensitivities[self.sensitivity])
             self.wait_for_complete()
 
         # Time constant adjustment
@@ -441,14 +450,14 @@ class Device(EmptyDevice):
         if self.sensitivity == "Auto sensitivity":
             self.wait_for_complete()
 
-        self.time_ref = time.time()
+        self.time_ref = time.monotonic()
             
     def trigger_ready(self):
 
         self.tc = self.get_time_constant()
 
         # makes sure that at least several time constants have passed after a new state/situation is achieved.
-        delta_time = (self.wait_time_constants * self.tc) - (time.time()-self.time_ref)
+        delta_time = (self.wait_time_constants * self.tc) - (time.monotonic()-self.time_ref)
         if delta_time > 0.0:
             time.sleep(delta_time)
 
@@ -483,24 +492,20 @@ class Device(EmptyDevice):
     def value_to_float(self, value):
 
         # convert unit and prefix to number
-        chars = OrderedDict([ 
-                                ("V", ""),
-                                ("s", ""),
-                                (" ", ""),
-                                ("n", "e-9"),
-                                ("µ", "e-6"),
-                                ("m", "e-3"),
-                                ("k", "e3"),
-                                ("M", "e6"),
-                                ("G", "e9"),
-                            ])
-
         if isinstance(value, str):
-            for char in chars:
-                value = value.replace(char, chars[char])
+            for char, replacement in _UNIT_CHARS:
+                value = value.replace(char, replacement)
 
         return float(value)
 
+    @cached_property
+    def timeconstants_numbers(self):
+        """
+        Returns:
+            list: time constants in s, only computed once they are needed
+        """
+        return [self.value_to_float(x) for x in self.timeconstants]
+
     def find_best_time_constant_key(self, time_constant):
 
         time_constant = self.value_to_float(time_constant)
@@ -539,7 +544,7 @@ class Device(EmptyDevice):
 
     def wait_for_complete(self):
 
-        starttime = time.time()
+        starttime = time.monotonic()
         while True:
             # only the direct GPIB status byte call works as it can be acquired even when the lock-in is
             # busy with auto sensitivity operation
@@ -547,7 +552,7 @@ class Device(EmptyDevice):
             if stb & 1 == 1:  # first byte indicates whether command is processed or not
                 break
             time.sleep(0.01)
-            if time.time() - starttime > 20:
+            if time.monotonic() - starttime > 20:
                 raise Exception("Timeout during wait for completion.")
 
     # get/set functions start here
@@ -30,9 +30,32 @@
 # Device: 7280DSP
 
 from EmptyDeviceClass import EmptyDevice
+import logging
+import re
 import time
+from functools import lru_cache
 import numpy as np
-from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# unit characters are removed and prefixes are replaced by exponents in a single pass
+_UNIT_REPLACEMENTS = {
+    "V": "",
+    "s": "",
+    " ": "",
+    "n": "e-9",
+    "µ": "e-6",
+    "m": "e-3",
+    "k": "e3",
+}
+_UNIT_RE = re.compile("[Vs nµmk]")
+
+
+@lru_cache(maxsize=None)
+def _unit_to_float(value):
+    # convert unit and prefix to number, cached as only the few time constant strings are converted
+    return float(_UNIT_RE.sub(lambda match: _UNIT_REPLACEMENTS[match.group()], value))
+
 
 class Device(EmptyDevice):
 
@@ -44,10 +67,171 @@ class Device(EmptyDevice):
     <li>ACGain can only be set to constant value if the sensitivity values allows it.</li>
     <li>ACGain will thus not work correctly with Auto sensitivity.</li>
     <li>Oscillator freqency and amplitude sweep are not yet supported.</li>
+    <li>Time constant option "Auto time - 10 periods" means that the time constant is automatically set to 10 periods of
+     the signal. You can change the number in front of periods to another value.</li>
+    <li>Default baudrate is 9600. For faster transfers, 19200 can be used by setting it at the instrument and in
+     the port manager of SweepMe!.</li>
     </ul>
     
     """
 
+    # I started to define dictionaries to translate GUI-commands into remote commands
+    # Attention: No Gui-selection should occur twice
+    commands = {
+        # "Frequency [Hz]": "FREQ",
+        # "Internal": "",
+        "Float": "FLOAT 1",
+        "Ground": "FLOAT 0",
+    }
+
+    source_commands = {
+        "Internal": "IE 0",
+        "External TTL Rear": "IE 1",
+        "External Analog Front": "IE 2",
+    }
+
+    input_commands = {
+        "Current B Normal, Front": "IMODE1; REF FRONT",
+        "Current B Low noise, Front": "IMODE2; REF FRONT",
+        "Current B High bandwidth, Front": "IMODE3; REF FRONT",
+        "Voltage A, Front": "IMODE0; VMODE 1; REF FRONT",
+        "Voltage -B, Front": "IMODE0; VMODE 2; REF FRONT",
+        "Voltage A-B, Front": "IMODE0; VMODE 3; REF FRONT",
+        "Current B Normal, Rear": "IMODE1; REF REAR",
+        "Current B Low noise, Rear": "IMODE2; REF REAR",
+        "Current B High bandwidth, Rear": "IMODE3; REF REAR",
+        "Voltage A, Rear": "IMODE0; VMODE 1; REF REAR",
+        "Voltage -B, Rear": "IMODE0; VMODE 2; REF REAR",
+        "Voltage A-B, Rear": "IMODE0; VMODE 3; REF REAR",
+    }
+
+    gains = {
+        "Auto gain": "AUTOMATIC 1",
+        "0 dB": "AUTOMATIC 0; ACGAIN 0",
+        "6 dB": "AUTOMATIC 0; ACGAIN 1",
+        "14 dB": "AUTOMATIC 0; ACGAIN 2",
+        "20 dB": "AUTOMATIC 0; ACGAIN 3",
+        "26 dB": "AUTOMATIC 0; ACGAIN 4",
+        "34 dB": "AUTOMATIC 0; ACGAIN 5",
+        "40 dB": "AUTOMATIC 0; ACGAIN 6",
+        "46 dB": "AUTOMATIC 0; ACGAIN 7",
+        "54 dB": "AUTOMATIC 0; ACGAIN 8",
+        "60 dB": "AUTOMATIC 0; ACGAIN 9",
+        "66 dB": "AUTOMATIC 0; ACGAIN 10",
+    }
+
+    inv_gains = {int(v[20:]): int(k[:-3]) for k, v in gains.items() if v.startswith("AUTOMATIC 0; ACGAIN")}
+
+    timeconstants = {
+        "1 µs": "TC 0; FASTMODE 1",
+        "2 µs": "TC 1; FASTMODE 1",
+        "5 µs": "TC 2; FASTMODE 1",
+        "10 µs": "TC 3; FASTMODE 1",
+        "20 µs": "TC 4; FASTMODE 1",
+        "50 µs": "TC 5; FASTMODE 1",
+        "100 µs": "TC 6; FASTMODE 1",
+        "200 µs": "TC 7; FASTMODE 1",
+        "500 µs": "TC 8; FASTMODE 0",
+        "1 ms": "TC 9; FASTMODE 0",
+        "2 ms": "TC 10; FASTMODE 0",
+        "5 ms": "TC 11; FASTMODE 0",
+        "10 ms": "TC 12; FASTMODE 0",
+        "20 ms": "TC 13; FASTMODE 0",
+        "50 ms": "TC 14; FASTMODE 0",
+        "100 ms": "TC 15; FASTMODE 0",
+        "200 ms": "TC 16; FASTMODE 0",
+        "500 ms": "TC 17; FASTMODE 0",
+        "1 s": "TC 18; FASTMODE 0",
+        "2 s": "TC 19; FASTMODE 0",
+        "5 s": "TC 20; FASTMODE 0",
+        "10 s": "TC 21; FASTMODE 0",
+        "20 s": "TC 22; FASTMODE 0",
+        "50 s": "TC 23; FASTMODE 0",
+        "100 s": "TC 24; FASTMODE 0",
+        "200 s": "TC 25; FASTMODE 0",
+        "500 s": "TC 26; FASTMODE 0",
+        "1 ks": "TC 27; FASTMODE 0",
+        "2 ks": "TC 28; FASTMODE 0",
+        "5 ks": "TC 29; FASTMODE 0",
+        "10 ks": "TC 30; FASTMODE 0",
+        "20 ks": "TC 31; FASTMODE 0",
+        "50 ks": "TC 32; FASTMODE 0",
+        "100 ks": "TC 33; FASTMODE 0",
+    }
+
+    sensitivities = {
+        "Auto sensitivity": "AS",
+        "10 nV": "SEN 3",
+        "20 nV": "SEN 4",
+        "50 nV": "SEN 5",
+        "100 nV": "SEN 6",
+        "200 nV": "SEN 7",
+        "500 nV": "SEN 8",
+        "1 µV": "SEN 9",
+        "2 µV": "SEN 10",
+        "5 µV": "SEN 11",
+        "10 µV": "SEN 12",
+        "20 µV": "SEN 13",
+        "50 µV": "SEN 14",
+        "100 µV": "SEN 15",
+        "200 µV": "SEN 16",
+        "500 µV": "SEN 17",
+        "1 mV": "SEN 18",
+        "2 mV": "SEN 19",
+        "5 mV": "SEN 20",
+        "10 mV": "SEN 21",
+        "20 mV": "SEN 22",
+        "50 mV": "SEN 23",
+        "100 mV": "SEN 24",
+        "200 mV": "SEN 25",
+        "500 mV": "SEN 26",
+        "1 V": "SEN 27",
+    }
+
+    inv_sensitivities = {v: k for k, v in sensitivities.items()}
+
+    # time constants in s, used to find the next possible time constant
+    _tc_float = {key: _unit_to_float(key) for key in timeconstants}
+
+    slopes = {
+        "6 dB/octave": "SLOPE 0",
+        "12 dB/octave": "SLOPE 1",
+        "18 dB/octave": "SLOPE 2",
+        "24 dB/octave": "SLOPE 3",
+    }
+
+    filter1_commands = {
+        "Off": "LF 0 0",
+        "50 Hz notch filter": "LF 1 1",
+        "60 Hz notch filter": "LF 1 0",
+        "100 Hz notch filter": "LF 2 1",
+        "120 Hz notch filter": "LF 2 0",
+        "50 Hz and 100 Hz notch filter": "LF 3 1",
+        "60 Hz and 120 Hz notch filter": "LF 3 0",
+    }
+
+    # LF [n1 n2] Signal channel line frequency rejection filter control
+    # The LF command sets the mode and frequency of the line frequency rejection (notch)
+    # filter according to the following tables:
+    # n1 Selection
+    # 0 Off
+    # 1 Enable 50 or 60 Hz notch filter
+    # 2 Enable 100 or 120 Hz notch filter
+    # 3 Enable both filters
+    # n2 Notch Filter Center Frequencies
+    # 0 60 Hz (and/or 120 Hz)
+    # 1 50 Hz (and/or 100 Hz)
+
+    filter2_commands = {
+        "Sync filter off": "SYNC 0",
+        "Sync filter on": "SYNC 1",
+    }
+
+    coupling_commands = {
+        "Fast": "CP 0",
+        "Slow": "CP 1",
+    }
+
     def __init__(self):
         EmptyDevice.__init__(self)
         
@@ -67,161 +251,9 @@ class Device(EmptyDevice):
                                  "baudrate": 9600,
                             }
 
-        # I started to define dictionaries to translate GUI-commands into remote commands
-        # Attention: No Gui-selection should occur twice
-        self.commands = OrderedDict([ 
-                               # ("Frequency [Hz]", "FREQ"),
-                               # ("Internal", ""),
-                               ("Float", "FLOAT 1"),
-                               ("Ground", "FLOAT 0"),
-                            ])
-                            
-        self.source_commands = OrderedDict([
-                                            ("Internal", "IE 0"),
-                                            ("External TTL Rear", "IE 1"),
-                                            ("External Analog Front", "IE 2"),
-                                            ])
-                            
-        self.input_commands = OrderedDict([
-                                           ("Current B Normal, Front", "IMODE1; REF FRONT"),
-                                           ("Current B Low noise, Front", "IMODE2; REF FRONT"),
-                                           ("Current B High bandwidth, Front", "IMODE3; REF FRONT"),
-                                           ("Voltage A, Front", "IMODE0; VMODE 1; REF FRONT"),
-                                           ("Voltage -B, Front", "IMODE0; VMODE 2; REF FRONT"),
-                                           ("Voltage A-B, Front", "IMODE0; VMODE 3; REF FRONT"),
-                                           ("Current B Normal, Rear", "IMODE1; REF REAR"),
-                                           ("Current B Low noise, Rear", "IMODE2; REF REAR"),
-                                           ("Current B High bandwidth, Rear", "IMODE3; REF REAR"),
-                                           ("Voltage A, Rear", "IMODE0; VMODE 1; REF REAR"),
-                                           ("Voltage -B, Rear", "IMODE0; VMODE 2; REF REAR"),
-                                           ("Voltage A-B, Rear", "IMODE0; VMODE 3; REF REAR"),
-                                          ])
-                        
-        self.gains =  OrderedDict([  
-                               ("Auto gain", "AUTOMATIC 1"),
-                               ("0 dB", "AUTOMATIC 0; ACGAIN 0"),
-                               ("6 dB", "AUTOMATIC 0; ACGAIN 1"),
-                               ("14 dB", "AUTOMATIC 0; ACGAIN 2"),
-                               ("20 dB", "AUTOMATIC 0; ACGAIN 3"),
-                               ("26 dB", "AUTOMATIC 0; ACGAIN 4"),
-                               ("34 dB", "AUTOMATIC 0; ACGAIN 5"),
-                               ("40 dB", "AUTOMATIC 0; ACGAIN 6"),
-                               ("46 dB", "AUTOMATIC 0; ACGAIN 7"),
-                               ("54 dB", "AUTOMATIC 0; ACGAIN 8"),
-                               ("60 dB", "AUTOMATIC 0; ACGAIN 9"),
-                               ("66 dB", "AUTOMATIC 0; ACGAIN 10")
-                                ])
-                                
-        self.inv_gains = {int(v[20:]): int(k[:-3]) for k, v in self.gains.items() if v.startswith("AUTOMATIC 0; ACGAIN")}
-        #print(self.inv_gains)
-                               
-        self.timeconstants = OrderedDict([
-                                ("1 µs", "TC 0; FASTMODE 1"),
-                                ("2 µs", "TC 1; FASTMODE 1"),
-                                ("5 µs", "TC 2; FASTMODE 1"),
-                                ("10 µs", "TC 3; FASTMODE 1"),
-                                ("20 µs", "TC 4; FASTMODE 1"),
-                                ("50 µs", "TC 5; FASTMODE 1"),
-                                ("100 µs", "TC 6; FASTMODE 1"),
-                                ("200 µs", "TC 7; FASTMODE 1"),
-                                ("500 µs", "TC 8; FASTMODE 0"),
-                                ("1 ms", "TC 9; FASTMODE 0"),
-                                ("2 ms", "TC 10; FASTMODE 0"),
-                                ("5 ms", "TC 11; FASTMODE 0"),
-                                ("10 ms", "TC 12; FASTMODE 0"),
-                                ("20 ms", "TC 13; FASTMODE 0"),
-                                ("50 ms", "TC 14; FASTMODE 0"),
-                                ("100 ms", "TC 15; FASTMODE 0"),
-                                ("200 ms", "TC 16; FASTMODE 0"),
-                                ("500 ms", "TC 17; FASTMODE 0"),
-                                ("1 s", "TC 18; FASTMODE 0"),
-                                ("2 s", "TC 19; FASTMODE 0"),
-                                ("5 s", "TC 20; FASTMODE 0"),
-                                ("10 s", "TC 21; FASTMODE 0"),
-                                ("20 s", "TC 22; FASTMODE 0"),
-                                ("50 s", "TC 23; FASTMODE 0"),
-                                ("100 s", "TC 24; FASTMODE 0"),
-                                ("200 s", "TC 25; FASTMODE 0"),
-                                ("500 s", "TC 26; FASTMODE 0"),
-                                ("1 ks", "TC 27; FASTMODE 0"),
-                                ("2 ks", "TC 28; FASTMODE 0"),
-                                ("5 ks", "TC 29; FASTMODE 0"),
-                                ("10 ks", "TC 30; FASTMODE 0"),
-                                ("20 ks", "TC 31; FASTMODE 0"),
-                                ("50 ks", "TC 32; FASTMODE 0"),
-                                ("100 ks", "TC 33; FASTMODE 0"),
-                            ])
-
-        self.sensitivities = OrderedDict([
-                                    ("Auto sensitivity", "AS"),
-                                    ("10 nV", "SEN 3"),
-                                    ("20 nV", "SEN 4"),
-                                    ("50 nV", "SEN 5"),
-                                    ("100 nV", "SEN 6"),
-                                    ("200 nV", "SEN 7"),
-                                    ("500 nV", "SEN 8"),
-                                    ("1 µV", "SEN 9"),
-                                    ("2 µV", "SEN 10"),
-                                    ("5 µV", "SEN 11"),
-                                    ("10 µV", "SEN 12"),
-                                    ("20 µV", "SEN 13"),
-                                    ("50 µV", "SEN 14"),
-                                    ("100 µV", "SEN 15"),
-                                    ("200 µV", "SEN 16"),
-                                    ("500 µV", "SEN 17"),
-                                    ("1 mV", "SEN 18"),
-                                    ("2 mV", "SEN 19"),
-                                    ("5 mV", "SEN 20"),
-                                    ("10 mV", "SEN 21"),
-                                    ("20 mV", "SEN 22"),
-                                    ("50 mV", "SEN 23"),
-                                    ("100 mV", "SEN 24"),
-                                    ("200 mV", "SEN 25"),
-                                    ("500 mV", "SEN 26"),
-                                    ("1 V", "SEN 27")
-                                    ])
-                                    
-        self.inv_sensitivities = {v: k for k, v in self.sensitivities.items()}
-
-        self.slopes = OrderedDict([
-                        ("6 dB/octave",  "SLOPE 0"),
-                        ("12 dB/octave", "SLOPE 1"),
-                        ("18 dB/octave", "SLOPE 2"),
-                        ("24 dB/octave", "SLOPE 3"),
-                        ])
-                        
-        self.filter1_commands = OrderedDict([
-                        ("Off",  "LF 0 0"),
-                        ("50 Hz notch filter", "LF 1 1"),
-                        ("60 Hz notch filter", "LF 1 0"),
-                        ("100 Hz notch filter", "LF 2 1"),
-                        ("120 Hz notch filter", "LF 2 0"),
-                        ("50 Hz and 100 Hz notch filter", "LF 3 1"),
-                        ("60 Hz and 120 Hz notch filter", "LF 3 0"),
-                        ])
-                        
-        # LF [n1 n2] Signal channel line frequency rejection filter control
-        # The LF command sets the mode and frequency of the line frequency rejection (notch)
-        # filter according to the following tables:
-        # n1 Selection
-        # 0 Off
-        # 1 Enable 50 or 60 Hz notch filter
-        # 2 Enable 100 or 120 Hz notch filter
-        # 3 Enable both filters
-        # n2 Notch Filter Center Frequencies
-        # 0 60 Hz (and/or 120 Hz)
-        # 1 50 Hz (and/or 100 Hz)
-
-        self.filter2_commands = OrderedDict([
-                               ("Sync filter off", "SYNC 0"),
-                               ("Sync filter on", "SYNC 1"),
-                            ])
-        
-        self.coupling_commands = OrderedDict([
-                                    ("Fast", "CP 0"),
-                                    ("Slow", "CP 1"),
-                                    ])
-                                                                
+        # default settings only need to be restored once, as configure sets all options again in every run
+        self._initialized = False
+
     def set_GUIparameter(self):
     
         GUIparameter = {
@@ -233,7 +265,7 @@ class Device(EmptyDevice):
                          "Filter2": list(self.filter2_commands.keys()),
                          # "Channel1": [],
                          # "Channel2": [],
-                         "TimeConstant": list(self.timeconstants.keys()),  # ["AutoTime"]
+                         "TimeConstant": list(self.timeconstants.keys()) + ["Auto time - 10 periods"],
                          "Gain": list(self.gains.keys()),
                          "Slope": list(self.slopes.keys()),
                          "Coupling": list(self.coupling_commands.keys()),
@@ -278,12 +310,15 @@ class Device(EmptyDevice):
                   "options. Please reselect the option with 'bandwidth' to remove this message")
             self.input = self.input.replace("bandwith", "bandwidth")
         
-        stb = self.get_status_byte()
-        print("Status byte:", stb)
+        if logger.isEnabledFor(logging.DEBUG):
+            stb = self.get_status_byte()
+            logger.debug("Status byte: %s", stb)
                
         self.port.write("REMOTE 1")  # stop front panel control
         self.port.write("LTS 1")  # controls front panel display
-        self.port.write("ADF 1")  # restore default settings
+        if not self._initialized:
+            self.port.write("ADF 1")  # restore default settings
+            self._initialized = True
         
         # self.port.write("DD 13") # set delimiter to ASCII 13
 
@@ -295,41 +330,37 @@ class Device(EmptyDevice):
         #self.port.write("REFMODE 0")
         #self.port.write("VRLOCK 0")
 
-        # Source adjustment
-        self.port.write(self.source_commands[self.source])
-        
-        # Input adjustment
-        self.port.write(self.input_commands[self.input])
-        
-        # Slope adjustment
-        self.port.write(self.slopes[self.slope])
-        
-        # Ground adjustment
-        self.port.write(self.commands[self.ground])
-        
-        # Coupling adjustment
-        self.port.write(self.coupling_commands[self.coupling])
-        
-        # self.port.write(self.commands[self.reserve])
-        
-        # set notch filter
-        self.port.write(self.filter1_commands[self.filter1])
+        commands = [
+            self.source_commands[self.source],  # Source adjustment
+            self.input_commands[self.input],  # Input adjustment
+            self.slopes[self.slope],  # Slope adjustment
+            self.commands[self.ground],  # Ground adjustment
+            self.coupling_commands[self.coupling],  # Coupling adjustment
+            self.filter1_commands[self.filter1],  # set notch filter
+            self.filter2_commands[self.filter2],  # sync filter
+            self.gains[self.gain],  # Gain adjustment
+        ]
 
-        # sync filter
-        self.port.write(self.filter2_commands[self.filter2])
-        
-        # Gain adjustment
-        self.port.write(self.gains[self.gain])
-       
         # Sensitivity adjustment
         if self.sensitivity != "Auto sensitivity":
-            self.port.write(self.sensitivities[self.sensitivity])
-            
-        # Timeconstant adjustment    
-        self.port.write(self.timeconstants[self.timeconstant])
-        
-        # Phase re-adjustment    
-        self.port.write("AQN")
+            commands.append(self.sensitivities[self.sensitivity])
+
+        # Timeconstant adjustment
+        if not self.timeconstant.startswith("Auto time"):
+            commands.append(self.timeconstants[self.timeconstant])
+            self._tc_seconds = self.unit_to_float(self.timeconstant)
+        else:
+            factor_periods_str = self.timeconstant.split("-")[1]
+            factor_auto_time_constant = factor_periods_str.replace("period", "").replace("s", "").replace(" ", "")
+            self.factor_auto_time_constant = float(factor_auto_time_constant)
+            # the time constant is set in 'adapt', until then the present setting of the instrument is used
+            self._tc_seconds = float(self.get_timeconstant())
+
+        # Phase re-adjustment
+        commands.append("AQN")
+
+        # all settings are sent as one compound command to save the round-trip time of each single write
+        self.port.write("; ".join(commands))
 
         if self.sweepmode == "Oscillator frequency in Hz":
             self.set_oscillator_amplitude(100)  # 100 mV amplitude
@@ -358,11 +389,12 @@ class Device(EmptyDevice):
     def adapt(self):
 
         # here we need to auto-adjust the time constant based on the frequency
-        frq = self.get_frequency()
-        period = 1.0/frq
-        time_constant = 10.0*period
-        new_tc_key = self.find_next_time_constant()
-        self.port.write(self.timeconstants[new_tc_key])
+        if self.timeconstant.startswith("Auto time"):
+            self._last_frq = self.get_frequency()
+            self._last_period = 1.0/self._last_frq
+            new_tc_key = self.find_next_time_constant(self.factor_auto_time_constant*self._last_period)
+            self.port.write(self.timeconstants[new_tc_key])
+            self._tc_seconds = self._tc_float[new_tc_key]
 
         if self.sensitivity == "Auto sensitivity":
             self.port.write("AS")
@@ -372,11 +404,11 @@ class Device(EmptyDevice):
         # could be used to figure out whether Auto Sensitivity has finished
         # stb = self.get_status_byte()
 
-        self.time_ref = time.time()
+        self.time_ref = time.monotonic()
             
     def trigger_ready(self):
         # make sure that at least several timeconstants have passed since 'Auto sensitivity' was called
-        delta_time = (self.waittimeconstants * self.unit_to_float(self.timeconstant)) - (time.time()-self.time_ref)
+        delta_time = (self.waittimeconstants * self._tc_seconds) - (time.monotonic()-self.time_ref)
         if delta_time > 0.0:
             # wait several timeconstants to allow for a renewal of the result     
             time.sleep(delta_time)
@@ -392,15 +424,23 @@ class Device(EmptyDevice):
 
     def read_result(self):
 
-        self.frq = self.get_frequency()
-        self.r = self.get_magnitude()
-        self.phi = self.get_phase()
-        self.sen = self.get_sensitivity()
+        # all results are queried with a single compound command to save the round-trip time of five further queries
+        self.port.write("MAG.;PHA.;FRQ.;SEN.;NHZ.;ACGAIN")
 
-        self.nhz = self.get_noise_density()
+        # the responses are separated by the delimiter character and parsed in one pass
+        answer = self.port.read()
+        values = np.fromstring(answer.replace(",", " "), sep=" ")
 
+        # the responses are split across several lines if the delimiter is set to carriage return
+        while len(values) < 6:
+            line = self.port.read()
+            if not line:
+                break
+            answer += " " + line
+            values = np.fromstring(answer.replace(",", " "), sep=" ")
 
-        self.acg = self.get_acgain()
+        self.r, self.phi, self.frq, self.sen, self.nhz, self.acg = values.tolist()  # Python floats instead of numpy scalars
+        self.acg = int(self.acg)
 
         self.acg_dB = self.inv_gains[self.acg]
 
@@ -411,19 +451,24 @@ class Device(EmptyDevice):
     # convenience functions start here
         
     def unit_to_float(self, unit):
-        # convert unit and prefix to number
-        chars = OrderedDict([ 
-                                ("V",""), 
-                                ("s",""),
-                                (" ",""),
-                                ("n","e-9"), 
-                                ("µ","e-6"),
-                                ("m","e-3")
-                            ])
-
-        for char in chars:
-            unit = unit.replace(char,chars[char])
-        return float(unit)
+        return _unit_to_float(unit)
+
+    def find_next_time_constant(self, time_constant):
+        """
+        finds the shortest time constant that is at least as long as the given one
+
+        Args:
+            time_constant: float, time constant in s
+
+        Returns:
+            str: key of the time constant
+        """
+        for key, value in self._tc_float.items():
+            if value >= time_constant:
+                return key
+
+        # the requested time constant is longer than any possible one, so the longest one is returned
+        return list(self._tc_float.keys())[-1]
 
     # get/set functions start here
 
@@ -448,7 +493,7 @@ class Device(EmptyDevice):
         return int(self.port.read())
 
     def set_oscillator_frequency(self, frequency):
-        self.port.write("OF. %1.9E" % float(frequency))
+        self.port.write(f"OF. {float(frequency):1.9E}")
 
     def set_oscillator_amplitude(self, value):
         """
@@ -460,7 +505,7 @@ class Device(EmptyDevice):
         Returns:
 
         """
-        self.port.write("OA. %i" % int(float(value)*1000))
+        self.port.write(f"OA. {int(float(value)*1000)}")
 
     def set_autosensitivity(self):
         self.port.write("AS")
@@ -34,7 +34,8 @@
 # * Instrument: Keithley 2700
 
 
-import time
+import weakref
+from functools import lru_cache
 
 import numpy as np
 import pyvisa
@@ -51,6 +52,9 @@ class Device(EmptyDevice):
 
                   """
 
+    # VISA port objects whose attributes are already set. Weak references drop port objects that are no longer used.
+    configured_ports = weakref.WeakSet()
+
     def __init__(self) -> None:
         """Initialize the device class and the instrument parameters."""
         super().__init__()
@@ -126,6 +130,9 @@ class Device(EmptyDevice):
             "External":  "EXT",
         }
 
+        # conservative maximum length of a message with several commands, longer messages are split
+        self.max_message_length = 256
+
         self.variables=["Variable1"]
         self.units=["Unit1"]
         self.plottype=[True]
@@ -149,16 +156,9 @@ class Device(EmptyDevice):
         self.mode = parameter["Mode"]
         self.digits = parameter["Digits"]  # Digits of resolution
         self.channel_string = parameter["Channel list"]
-        intermediate_list = self.channel_string.replace(",",";").split(";")
-        self.channel_list = []
-        for x in intermediate_list:
-            if ":" in x:
-                first,last=x.split(":")
-                channels_to_add = list(range(int(first),int(last)+1))
-                self.channel_list+=[str(x) for x in channels_to_add]
-            else:
-                self.channel_list+=[x]
-        self.channel_names = ["Dev"+x[1:] for x in self.channel_list]
+        channels, channel_names = self.expand_channels(self.channel_string)
+        self.channel_list = list(channels)
+        self.channel_names = list(channel_names)
         #self.channel_names = parameter['Channel names'].split(';')
         #self.channel_list = parameter['Channel list']#.replace(" ", "").replace("-", "").split(",")
         self.trigger_type = parameter["Trigger"]
@@ -193,47 +193,83 @@ class Device(EmptyDevice):
             self.plottype = [True]  # True to plot data
             self.savetype = [True]
 
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def expand_channels(channel_string: str) -> tuple:
+        """Expand a channel string like '101:103;110' into a tuple of channels and a tuple of channel names."""
+        channels = []
+        for x in channel_string.replace(",", ";").split(";"):
+            if ":" in x:
+                first, last = x.split(":")
+                channels.extend(str(channel) for channel in range(int(first), int(last) + 1))
+            else:
+                channels.append(x)
+        channel_names = ["Dev" + x[1:] for x in channels]
+
+        # tuples are returned as the result is cached and must not be modified
+        return tuple(channels), tuple(channel_names)
+
     def connect(self) -> None:
         """Connect to the device. This function is called only once at the start of the measurement."""
-        if self.port_string.startswith("TCPIP"):
+        # The attributes belong to the VISA session, so they only need to be set once until the port is disconnected
+        if self.port_string.startswith("TCPIP") and self.port.port not in Device.configured_ports:
             self.port.port.set_visa_attribute(pyvisa.constants.VI_ATTR_IO_PROT,4)
             self.port.port.set_visa_attribute(pyvisa.constants.VI_ATTR_TERMCHAR_EN,1)
             self.port.port.set_visa_attribute(pyvisa.constants.VI_ATTR_SEND_END_EN,1)
+            Device.configured_ports.add(self.port.port)
+
+        if not self.port_string.startswith("COM"):
+            # A larger read chunk lets a whole scan be read at once instead of in several 20 kB chunks, at the cost of
+            # a bigger receive buffer. About 24 bytes are needed for each ASCII reading including the separator.
+            self.port.port.chunk_size = max(32768, len(self.channel_list) * 24 + 256)
+
+    def disconnect(self) -> None:
+        """Disconnect from the device. This function is called only once at the end of the measurement."""
+        # A port object that is closed and opened again gets a new VISA session without the attributes set in 'connect'
+        Device.configured_ports.discard(self.port.port)
 
     def initialize(self) -> None:
         """Initialize the device. This function is called only once at the start of the measurement."""
-        self.port.write("*RST")
-        self.port.write("STAT:QUE:CLE")  # clear error queue
-        self.port.write("trac:cle")  # clear buffer
-        self.port.write("*CLS")  # reset all values
-        self.port.write("SYST:BEEP:STAT OFF")  # control-Beep off
+        self.write_batch([
+            "*RST",
+            "STAT:QUE:CLE",  # clear error queue
+            "trac:cle",  # clear buffer
+            "*CLS",  # reset all values
+            "SYST:BEEP:STAT OFF",  # control-Beep off
+        ])
 
     def configure(self) -> None:
         """Configure the device. This function is called every time the device is used in the sequencer."""
+        # All commands are set commands that are collected and sent in as few messages as possible
+        commands = []
+
+        mode = self.modes[self.mode]
+        ch_clause = f"(@{self.channel_string})"
+
         # Sense functions
-        self.port.write("sense:function '%s', (@%s)" % (self.modes[self.mode], self.channel_string))
+        commands.append(f"sense:function '{mode}', {ch_clause}")
         # self.range = self.range.replace(" ", "").replace("p", "e-12").replace("n", "e-9").replace("µ", "e-6").replace("m", "e-3")
 
         if "Temperature" in self.mode or "Continuity" in self.mode:
-            self.port.write("CONF:" + self.modes[self.mode] + " (@%s)" % (self.channel_string) )
+            commands.append(f"CONF:{mode} {ch_clause}")
         else:
             if self.range == "Auto":
-                self.port.write("%s:range:auto on, (@%s)" % (self.modes[self.mode], self.channel_string))
+                commands.append(f"{mode}:range:auto on, {ch_clause}")
             else:
-                #self.port.write("%s:range:auto off, (@%s)" % (self.modes[self.mode], self.channel_string))
-                self.port.write("%s:range %s, (@%s)" % (self.modes[self.mode], str(self.range), self.channel_string))
+                #commands.append(f"{mode}:range:auto off, {ch_clause}")
+                commands.append(f"{mode}:range {self.range}, {ch_clause}")
 
             # Write number of digits resolution
-            self.port.write("%s:dig %s, (@%s)" % (self.modes[self.mode], self.digits, self.channel_string) )
+            commands.append(f"{mode}:dig {self.digits}, {ch_clause}")
 
         # The following configuration is incompatible with scanning, but may be needed for individual measurements:
         #self.port.write("CONF:%s %s, (@%s)" % (self.modes[self.mode], self.resolution, self.channel_string))  # we send the command of the selected mode and append range, resolution and channel list
 
         # Trigger
-        self.port.write("INIT:CONT OFF")  # disable continuous initiation, needed to use "READ?" command
-        self.port.write("TRIG:SOUR %s" % self.trigger_types[self.trigger_type])
-        self.port.write("trigger:count 1")  # Only scan through a list once
-        self.port.write("TRIG:DEL 0.5")
+        commands.append("INIT:CONT OFF")  # disable continuous initiation, needed to use "READ?" command
+        commands.append(f"TRIG:SOUR {self.trigger_types[self.trigger_type]}")
+        commands.append("trigger:count 1")  # Only scan through a list once
+        commands.append("TRIG:DEL 0.5")
 
         # Speed
         if self.integration_speed == "Fast":
@@ -244,21 +280,23 @@ class Device(EmptyDevice):
             self.nplc = 10.0
         else:
             self.nplc = 1.0
-        self.port.write(":SENS:%s:NPLC %s" % (self.modes[self.mode], str(self.nplc)))
+        commands.append(f":SENS:{mode}:NPLC {self.nplc}")
 
         # Sample count:
         # Note, sample count is the number of measurements that will be returned,
         # not the number of measurements per channel.
         if self.scanning:
-            self.port.write("sample:count " + str(len(self.channel_list)))
+            commands.append(f"sample:count {len(self.channel_list)}")
         else:
-            self.port.write("sample:count 1")
+            commands.append("sample:count 1")
 
         # Scanning
         if self.scanning:
-            self.port.write("route:scan (@" + self.channel_string + ")")  # start scan in the background
-            self.port.write("ROUT:SCAN:TSO IMM")  # Start scan immediately when enabled and triggered
-            self.port.write("ROUT:SCAN:LSEL INT")  # Enable Scan
+            commands.append(f"route:scan {ch_clause}")  # start scan in the background
+            commands.append("ROUT:SCAN:TSO IMM")  # Start scan immediately when enabled and triggered
+            commands.append("ROUT:SCAN:LSEL INT")  # Enable Scan
+
+        self.write_batch(commands)
 
     def deinitialize(self) -> None:
         """Deinitialize the device. This function is called only once at the end of the measurement."""
@@ -269,35 +307,65 @@ class Device(EmptyDevice):
         self.port.write("INIT") #initialize trigger
 
     def read_result(self) -> None:
-        """Read out the result buffer."""
-        # normally 16 bytes reserved for each entry in buffer: 8 bytes per measure value, 8 bytes per timestamp
-        while True:
-            if self.is_run_stopped():
-                break
-
-            self.port.write("TRAC:FREE?")
-            bytes_in_buffer = self.port.read().split(",")
-            bytes_in_use = bytes_in_buffer[1]
-
-            if int(bytes_in_use) >= len(self.channel_list)*16:
-                break
-
-            time.sleep(0.1)
+        """Wait until the scan is finished."""
+        # *OPC? is answered as soon as the scan started in 'measure' is finished. With manual, bus or external
+        # triggers this can take longer than the port timeout, so the answer is read repeatedly until the run is
+        # stopped.
+        self.port.write("*OPC?")
+        while not self.is_run_stopped():
+            try:
+                if self.port.read():  # COM ports return an empty string on timeout
+                    return
+            except pyvisa.errors.VisaIOError as e:
+                if e.error_code != pyvisa.constants.StatusCode.error_timeout:
+                    raise
+
+        # the run was stopped while waiting, the pending answer of *OPC? must not be read by the next query
+        if self.port_string.startswith("COM"):
+            self.port.port.reset_input_buffer()
+        else:
+            self.port.port.clear()
 
     def call(self) -> list:
         """Return the measurement results. Must return as many values as defined in self.variables."""
-        self.port.write("form:elem READ\n;FETCh?")
+        self.port.write("FORM:ELEM READ;:FETCh?")  # leading colon resets the command tree for FETCh?
         answer = self.port.read()  # here we read the response from the "READ?" request in 'measure'
-        readings_list = np.array([float(x) for x in answer.strip("\n").split(",")])
 
-        if self.scanning:
-            # Currently averaging is not implemented for scanning
-            return list(readings_list) # [np.mean(x) for x in np.split(readings_list,len(self.channel_list))]
+        if not self.scanning:
+            # the readings are averaged without creating an array, usually the sample count is 1 if not scanning
+            readings = answer.strip().split(",")
+            return [sum(map(float, readings)) / len(readings)]
 
-        return [np.mean(readings_list)]
+        readings_list = np.fromstring(answer.strip(), sep=",")  # parses all readings in one pass
+        if len(readings_list) != len(self.channel_list):
+            msg = f"Received {len(readings_list)} readings, but {len(self.channel_list)} channels were scanned."
+            raise Exception(msg)
+
+        # Currently averaging is not implemented for scanning
+        return readings_list.tolist() # [np.mean(x) for x in np.split(readings_list,len(self.channel_list))]
 
     # here, command-wrapping functions are defined
 
+    def write_batch(self, commands: list) -> None:
+        """Send several set commands joined by semicolons to save the round-trip time of each single write.
+
+        Each command is prefixed with a colon to start at the root of the SCPI command tree, as otherwise it would be
+        interpreted relative to the previous command. Queries must not be sent with this function.
+        """
+        message = ""
+        for command in commands:
+            cmd = command if command.startswith((":", "*")) else f":{command}"
+
+            # start a new message if the current one would get longer than the input buffer of the instrument
+            if message and len(message) + len(cmd) + 1 > self.max_message_length:
+                self.port.write(message)
+                message = ""
+
+            message = f"{message};{cmd}" if message else cmd
+
+        if message:
+            self.port.write(message)
+
     def get_identification(self) -> str:
         """Return the identification string of the device."""
         self.port.write("*IDN?")
@@ -113,6 +113,11 @@ class Device(EmptyDevice):
             "Positive overshoot in %": "POV",
             "Negative overshoot in %": "NOV",
         }
+        # GUI mode -> (mode code, short name, unit), split once instead of for every place
+        self.mode_meta = {
+            mode: (code, mode.split(" in ")[0], mode.split(" in ")[-1] if " in " in mode else "")
+            for mode, code in self.modes.items()
+        }
         self.statistic_modes = [
             "None",
             "Current",
@@ -120,12 +125,22 @@ class Device(EmptyDevice):
             "Maximum",
             "Average",
         ]
+        # Query templates to read out the result of a place, statistics without entry read out the current value
+        self.statistic_queries = {
+            "Minimum": "MEAS{place}:RES:NPE?",  # Negative Peak
+            "Maximum": "MEAS{place}:RES:PPE?",
+            "Average": "MEAS{place}:RES:AVG?",
+        }
 
         # Measurement places - The devices can have up to 6 measurement 'places' with predefined modes and sources to
         # read out.
         self.maximum_measurement_places: int = 6  # For RTB2004, might differ for other devices
         self.measurement_places: dict[int, tuple[int, str, str]] = {}
         """A dictionary with the place number as key and a tuple of channel, mode code, and statistics as value."""
+        self.place_queries: dict[int, str] = {}
+        """A dictionary with the place number as key and the query to read out its result as value."""
+        self.configure_command: str = ""
+        """Commands to set source and mode of all measurement places, built once the GUI parameters are applied."""
 
         # If True, the measurement places are defined on the device and used as is. If False, the places are defined in
         # the GUI. This mode is currently disabled as SweepMe cannot update the number of variables during runtime, so
@@ -136,6 +151,9 @@ class Device(EmptyDevice):
         self.waveform_count: int = 1
         """Number of waveform to average. If set to 1, no averaging is performed."""
 
+        self.use_statistics: bool = False
+        """True if the statistical evaluation is needed, i.e. for averaging or when using the preset."""
+
     @staticmethod
     def parse_parameter(func: Callable[[Any], T], parameters: dict[str, Any], key: str, fallback: T) -> T:
         """Parse and convert a parameter from the given dictionary and return the value or a fallback value."""
@@ -169,6 +187,7 @@ class Device(EmptyDevice):
         """Receive the values of the GUI parameters that were set by the user in the SweepMe! GUI."""
         # self.use_preset = bool(parameters["Use preset"])
         self.waveform_count = self.parse_parameter(int, parameters, "Waveform count", 1)
+        self.use_statistics = self.waveform_count > 1 or self.use_preset
 
         self.measurement_places = {}  # Reset measurement places
 
@@ -195,16 +214,26 @@ class Device(EmptyDevice):
                 statistics = parameters.get(f"Place {place} statistics", "None")
                 if channel != "None" and mode != "None":
                     channel_num = int(channel[-1])
-                    self.measurement_places[place] = (channel_num, self.modes[mode], statistics)
+                    code, mode_short, unit = self.mode_meta[mode]
+                    self.measurement_places[place] = (channel_num, code, statistics)
 
-                    mode_short = mode.split(" in ")[0]
                     self.variables.append(f"{channel} {mode_short}")
-                    self.units.append(mode.split(" in ")[-1])
+                    self.units.append(unit)
                     self.plottype.append(True)
                     self.savetype.append(True)
 
+        # All places are configured with a single message. The leading colon makes each command start at the root.
+        self.configure_command = ";:".join(
+            f"MEAS{place}:SOUR CH{channel};:MEAS{place}:MAIN {mode};:MEAS{place}:ENAB ON"
+            for place, (channel, mode, _) in self.measurement_places.items()
+        )
+        self.update_place_queries()
+
     def connect(self) -> None:
         """Connect to the device. This function is called only once at the start of the measurement."""
+        # A larger read chunk lets the results of all places be read at once, at the cost of a bigger receive buffer
+        self.port.port.chunk_size = 65536
+
         if self.use_preset:
             self.measurement_places = {}
             for place in range(1, self.maximum_measurement_places + 1):
@@ -215,6 +244,8 @@ class Device(EmptyDevice):
                     self.measurement_places[place] = (source, mode, "Average")
                     # If SweepMe! allows updating variables during runtime, this could be done here
 
+            self.update_place_queries()
+
     def initialize(self) -> None:
         """Initialize the device. This function is called only once at the start of the measurement."""
         # do not use "SYST:PRES" as it will destroy all settings which is in conflict with using 'As is'
@@ -222,48 +253,45 @@ class Device(EmptyDevice):
 
     def configure(self) -> None:
         """Configure the device. This function is called every time the device is used in the sequencer."""
-        if not self.use_preset:
-            for place, (channel, mode, _) in self.measurement_places.items():
-                self.set_source(place, channel)
-                self.set_measurement_mode(place, mode)
+        if not self.use_preset and self.configure_command:
+            self.port.write(self.configure_command)
 
-        if self.waveform_count > 1 or self.use_preset:
+        if self.use_statistics:
             # Enable statistical evaluation for all places. Place number is irrelevant.
             self.port.write("MEAS1:STAT:ENAB ON")
 
     def measure(self) -> None:
         """Reset the averaged values at the start of the measurement."""
-        if self.waveform_count > 1 or self.use_preset:
-            for place in self.measurement_places:
-                self.reset_statistical_measurement(place)
+        if not self.measurement_places or not self.use_statistics:
+            return
+
+        self.port.write(";:".join(f"MEAS{place}:STAT:RES" for place in self.measurement_places))
 
     def request_result(self) -> None:
         """Wait until the given number of waveforms are acquired."""
-        if self.waveform_count > 1:
-            for place in self.measurement_places:
-                while self.get_waveform_count(place) < self.waveform_count:
-                    time.sleep(0.1)
+        if not self.measurement_places or self.waveform_count <= 1:
+            return
+
+        # The waveform counts of all places are requested with a single message
+        query = ";:".join(f"MEAS{place}:RES:WFMCount?" for place in self.measurement_places)
+        while True:
+            self.port.write(query)
+            waveform_counts = [int(count) for count in self.port.read().split(";")]
+            if min(waveform_counts) >= self.waveform_count:
+                break
+            time.sleep(0.1)
 
     def call(self) -> list[float]:
         """'call' is a mandatory function that must be used to return as many values as defined in self.variables.
 
         This function can only be omitted if no variables are defined in self.variables.
         """
-        measured_results = []
-        for place, (_, mode, statistics) in self.measurement_places.items():
-            if statistics == "Minimum":
-                result = self.get_measurement_minimum(place)
-            elif statistics == "Maximum":
-                result = self.get_measurement_maximum(place)
-            elif statistics == "Average":
-                result = self.get_averaged_measurement(place)
-            elif statistics == "Current":
-                result = self.get_measurement(place, mode)
-            else:
-                # If no statistics are defined, return the current measurement
-                result = self.get_measurement(place, mode)
-
-            measured_results.append(result)
+        if not self.measurement_places:
+            return [float("nan")] * self.maximum_measurement_places if self.use_preset else []
+
+        # All results are requested with a single message and are returned separated by semicolons
+        self.port.write(";:".join(self.place_queries[place] for place in self.measurement_places))
+        measured_results = [self.parse_result(result) for result in self.port.read().split(";")]
 
         # If the preset uses less than the maximum number of places, fill the measured results with None as placeholder
         if self.use_preset and len(measured_results) < self.maximum_measurement_places:
@@ -272,6 +300,14 @@ class Device(EmptyDevice):
 
         return measured_results
 
+    def update_place_queries(self) -> None:
+        """Build the query to read out the result of each measurement place according to its statistics."""
+        # If no statistics are defined, return the current measurement
+        self.place_queries = {
+            place: self.statistic_queries.get(statistics, "MEAS{place}:RES:ACT? {mode}").format(place=place, mode=mode)
+            for place, (_, mode, statistics) in self.measurement_places.items()
+        }
+
     """ Wrapped Functions """
 
     def set_source(self, place: int, channel: int) -> None:
@@ -329,6 +365,11 @@ class Device(EmptyDevice):
 
     def read_result_and_handle_error(self) -> float:
         """Read out the buffer and handle the error code."""
-        ret = self.port.read()
+        return self.parse_result(self.port.read())
+
+    @staticmethod
+    def parse_result(ret: str) -> float:
+        """Convert a returned result to float and handle the error code."""
+        ret = ret.strip()
         # 9.91E+37 is the error code
         return float(ret) if ret != "9.91E+37" else float("nan")